@@ -4,10 +4,10 @@ from sys import argv
 from tempfile import mkdtemp
 from json_tricks import load as jt_load, dump as jt_dump
 from matplotlib.pyplot import show
-from numpy import mean, loadtxt, array, std
+from numpy import mean, loadtxt, array, std, abs as np_abs
 from numpy.random import RandomState
 from scipy import sparse
-from methods import METHODS
+from methods import METHODS, LOSSY_METHODS, LOSSY_REFERENCE
 from visualize import plot_results
 
 
@@ -64,6 +64,12 @@ class Benchmark(object):
 		assert self.done
 		return std(tuple(inst.storage_space for inst in self.done))
 	
+	@property
+	def max_error(self):
+		# only lossy methods record an error; it is the same for every repetition
+		assert self.done
+		return max(getattr(inst, 'max_error', None) or 0. for inst in self.done)
+	
 	def __str__(self):
 		return 'benchmark {0:s} {2:d}/{1:d}'.format(self.cls.__name__, self.reps, len(self.done))
 	
@@ -81,6 +87,19 @@ class Benchmark(object):
 			self.load_time, self.storage_space/1024., len(self.done), self.reps, self.save_time_std, self.load_time_std, self.storage_space_std/1024.))
 
 
+def log_gains(reference, insts):
+	"""
+	Show the error of each lossy method relative to the data scale, and the gain in size and speed compared to
+	the lossless reference.
+	"""
+	data_scale = float(np_abs(reference.data).max()) or 1.
+	print('{0:12s}  {1:>9s}  {2:>6s}  {3:>6s}  {4:>6s}'.format('method', 'rel.error', 'size', 'save', 'load'))
+	for bm in insts:
+		print('{0:12s}  {1:9.2e}  {2:5.1f}x  {3:5.1f}x  {4:5.1f}x'.format(bm.cls.__name__, bm.max_error / data_scale,
+			reference.storage_space / bm.storage_space, reference.save_time / bm.save_time,
+			reference.load_time / bm.load_time))
+
+
 def random_data(size, is_sparse=False, is_big=True):
 	rs = RandomState(seed=123456789)
 	if is_sparse:
@@ -113,6 +132,17 @@ if __name__ == '__main__':
 		# sinsts = sorted(insts, key=lambda inst: (inst.save_time + inst.load_time) * inst.storage_space)
 		fig, ax = plot_results(insts, fname='bm_{0:s}.png'.format(name),
 			suptitle='{1:s} storage performance ({2:d}x{3:d}, avg of {0:d}x)'.format(reps, label, *data.shape))
+		print('>> lossy {0:s} <<'.format(name))
+		reference = next(bm for bm in insts if bm.cls is LOSSY_REFERENCE)
+		lossy_insts = tuple(Benchmark(cls, data, data_name=name, reps=reps) for cls in LOSSY_METHODS)
+		for bm in lossy_insts:
+			bm.run()
+			bm.log()
+		log_gains(reference, lossy_insts)
+		# few bars, so show all of them instead of clipping the slowest
+		lossy_xlim = 1.15 * max(max(bm.save_time, bm.load_time) for bm in (reference,) + lossy_insts) * 1000
+		plot_results((reference,) + lossy_insts, fname='bm_{0:s}_lossy.png'.format(name), xlim=lossy_xlim,
+			suptitle='{1:s} lossy storage ({2:d}x{3:d}, avg of {0:d}x)'.format(reps, label, *data.shape))
 	show()
 
 
@@ -12,7 +12,7 @@ import msgpack_numpy
 from imgarray import save_array_img, load_array_img
 from json_tricks import dump as jt_dump, load as jt_load
 from numpy import array_equal, savetxt, loadtxt, frombuffer, save as np_save, load as np_load, savez_compressed, array, \
-	float64
+	float64, float32, int8, int16, uint8, uint64, rint, frexp, ldexp, finfo, iinfo, nextafter, errstate, inf, abs as np_abs
 from pandas import read_stata, DataFrame, read_html, read_excel
 from scipy.io import savemat, loadmat, FortranFile
 
@@ -56,9 +56,13 @@ class TimeArrStorage(object):
 		sm = arr.sum()  # this is necessary to make sure it isn't lazy-loaded
 		self.load_time = time() - t0
 		remove(pth)
-		assert array_equal(arr, ref_arr), 'load failed for {0:}'.format(self)
+		assert self.verify(arr, ref_arr), 'load failed for {0:}'.format(self)
 		return sm
 	
+	def verify(self, arr, ref_arr):
+		# lossless methods must reproduce the data exactly; lossy ones override this
+		return array_equal(arr, ref_arr)
+	
 
 class Csv(TimeArrStorage):
 	def save(self, arr, pth):
@@ -322,6 +326,141 @@ class MsgPack(TimeArrStorage):
 			return msgpack.unpackb(fh.read(), object_hook=msgpack_numpy.decode)
 
 
+class LossyGzip(TimeArrStorage):
+	"""
+	Base for lossy methods: `encode` turns the float64 array into a smaller representation plus a scale and
+	offset, which is stored like `BinaryGzip`. Loading should be within `error_bound` of the original.
+	"""
+	compresslevel = 9
+	
+	def __init__(self, reps=100):
+		super(LossyGzip, self).__init__(reps=reps)
+		self.max_error = None
+	
+	def encode(self, arr):
+		raise NotImplementedError
+	
+	def decode(self, stored, scale, offset):
+		# gets the flat stored array; the result is reshaped afterwards
+		return stored.astype(float64) * scale + offset
+	
+	def error_bound(self, ref_arr):
+		# maximum absolute error allowed, either for the whole array or per element
+		raise NotImplementedError
+	
+	def save(self, arr, pth):
+		stored, scale, offset = self.encode(arr)
+		with gzip.open(pth, 'wb+', compresslevel=self.compresslevel) as fh:
+			fh.write('{0:} {1:} {2:} {3!r} {4!r}\n'.format(stored.dtype, arr.shape[0], arr.shape[1],
+				float(scale), float(offset)).encode('ascii'))
+			fh.write(stored.data)
+			sync(fh)
+
+	def load(self, pth):
+		with gzip.open(pth, 'rb') as fh:
+			header = fh.readline()
+			data = fh.read()
+		dtype, w, h, scale, offset = header.decode('ascii').strip().split()
+		stored = frombuffer(data, dtype=dtype)
+		return self.decode(stored, float64(scale), float64(offset)).reshape((int(w), int(h)))
+	
+	def verify(self, arr, ref_arr):
+		if arr.shape != ref_arr.shape:
+			return False
+		error = np_abs(arr - ref_arr)
+		self.max_error = float(error.max())
+		return bool((error <= self.error_bound(ref_arr)).all())
+
+
+class Downcast(LossyGzip):
+	# scaled by a power of two into (-2, 2), so that huge doubles don't overflow float32; values that
+	# round up to 2 are clipped, because 2 * scale is beyond the largest double if the data reaches it
+	limit = nextafter(float32(2), float32(0))
+	
+	def scale(self, arr):
+		return ldexp(1., int(frexp(np_abs(arr).max())[1]) - 1)
+	
+	def encode(self, arr):
+		scale = self.scale(arr)
+		return (arr / scale).astype(float32).clip(-self.limit, self.limit), scale, 0.
+	
+	def error_bound(self, ref_arr):
+		eps = finfo(float32)
+		return np_abs(ref_arr) * eps.epsneg + self.scale(ref_arr) * eps.tiny
+
+
+class Quantize(LossyGzip):
+	# integers spread evenly over the data range; `max/2 - min/2` keeps the range finite even if the
+	# data spans all doubles, but decoding can still round past the largest double, so it is clipped
+	int_type = None
+	
+	def range(self, arr):
+		lo, hi = arr.min(), arr.max()
+		mid, half = hi / 2 + lo / 2, hi / 2 - lo / 2
+		levels = iinfo(self.int_type).max
+		step = (half or 1.) / levels
+		with errstate(over='ignore'):
+			too_small = step * levels < half
+		if too_small:
+			# subnormal steps are rounded coarsely (even to zero), so round up to still cover the range
+			step = nextafter(step, inf)
+		return mid, half, step
+	
+	def encode(self, arr):
+		# rounding of `mid` and `step` can push values just past the integer range, so clip instead of wrapping
+		mid, half, step = self.range(arr)
+		levels = iinfo(self.int_type).max
+		return rint((arr - mid) / step).clip(-levels, levels).astype(self.int_type), step, mid
+	
+	def decode(self, stored, scale, offset):
+		big = finfo(float64).max
+		with errstate(over='ignore'):
+			arr = stored.astype(float64) * scale + offset
+		return arr.clip(-big, big, out=arr)
+	
+	def error_bound(self, ref_arr):
+		# half a step, plus rounding of the arithmetic (the last term for subnormal ranges)
+		mid, half, step = self.range(ref_arr)
+		eps = finfo(float64).eps
+		return 0.5 * step + 4 * eps * abs(mid) + 4 * eps * half + ldexp(1., -1072)
+
+
+class Quant16(Quantize):
+	int_type = int16
+
+
+class Quant8(Quantize):
+	int_type = int8
+
+
+class Truncate(LossyGzip):
+	# zero the lowest mantissa bits and group the bytes by significance (like HDF5's shuffle filter), so that
+	# gzip finds long runs of zeros; at the default level 9, unshuffled truncated data compresses very slowly,
+	# and once shuffled, higher levels barely help
+	keep_bits = None
+	compresslevel = 1
+	
+	def encode(self, arr):
+		mask = uint64((1 << 64) - (1 << (52 - self.keep_bits)))
+		truncated = arr.astype(float64).view(uint64) & mask
+		return truncated.view(uint8).reshape((-1, 8)).T.copy(), 1., 0.
+	
+	def decode(self, stored, scale, offset):
+		# unit scale, so only undo the shuffle
+		return stored.reshape((8, -1)).T.copy().view(float64)
+	
+	def error_bound(self, ref_arr):
+		return np_abs(ref_arr) * ldexp(1., -self.keep_bits) + ldexp(1., -1074 + 52 - self.keep_bits)
+
+
+class Trunc32(Truncate):
+	keep_bits = 32
+
+
+class Trunc16(Truncate):
+	keep_bits = 16
+
+
 METHODS = (
 	Csv,
 	CsvGzip,
@@ -345,3 +484,13 @@ METHODS = (
 	# MatFile,
 	# Stata,
 )
+
+# lossy methods, from smallest to largest error; compared against `LOSSY_REFERENCE`
+LOSSY_REFERENCE = BinaryGzip
+LOSSY_METHODS = (
+	Trunc32,
+	Downcast,
+	Trunc16,
+	Quant16,
+	Quant8,
+)
@@ -0,0 +1,35 @@
+
+# round-trip every lossy method, including the extremes of float64, and check the declared error bounds
+
+from os.path import join
+from tempfile import mkdtemp
+from numpy import array, zeros, full, finfo, float64
+from numpy.random import RandomState
+from methods import LOSSY_METHODS
+
+big = finfo(float64).max
+rs = RandomState(seed=123456789)
+
+inputs = (
+	('random', rs.rand(100, 40) - 0.5, True),
+	('huge', (rs.rand(100, 40) - 0.5) * big, True),
+	('float64 limit', array([[big, -big], [0., 1e-310]]), False),
+	('subnormal', array([[5e-324, -1e-310], [2.2e-308, 0.]]), False),
+	# narrow spread on a large offset, and tiny subnormals; rounding used to push quantized values out of range
+	('large offset', -2026.067 + RandomState(seed=2).rand(100, 40) * 1e-9, False),
+	('subnormal positive', array([[1., 2.], [3., 4.]]) * 1e-318, False),
+	('sign mix', array([[-3., 2.5], [1e-12, -1e12]]), False),
+	('constant', full((10, 4), 3.14), False),
+	('zeros', zeros((10, 4)), False),
+)
+
+for cls in LOSSY_METHODS:
+	for name, data, is_lossy in inputs:
+		inst = cls()
+		pth = join(mkdtemp(), '{0:s}.{1:s}'.format(cls.__name__, inst.extension))
+		inst.time_save(data, pth)
+		inst.time_load(data, pth)  # asserts that `verify` passes
+		assert inst.max_error is not None
+		if is_lossy:
+			assert inst.max_error > 0, '{0:s} was not lossy for {1:s} data'.format(cls.__name__, name)
+		print('{0:10s} {1:14s} max error {2:.3e}'.format(cls.__name__, name, inst.max_error))
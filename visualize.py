@@ -12,9 +12,9 @@ def add_bar_labels(ax, patches, values, xlim=None, fontsize=16, template='{0:.3f
 			ha='left', va='center', fontsize=fontsize)
 
 
-def plot_results(insts, fname='benchmark.png', suptitle='Benchmark result'):
+def plot_results(insts, fname='benchmark.png', suptitle='Benchmark result', xlim=None):
 	"""
-	Make some bar charts with results
+	Make some bar charts with results; by default the time axis clips the four slowest save times.
 	"""
 	fontsize = 15
 	cm = iter(seaborn.color_palette('colorblind'))
@@ -26,7 +26,7 @@ def plot_results(insts, fname='benchmark.png', suptitle='Benchmark result'):
 	twax = ax.twiny()
 	save_times = tuple(inst.save_time * 1000 for inst in insts)
 	load_times = tuple(inst.load_time * 1000 for inst in insts)
-	xlim = sorted(save_times)[-5]
+	xlim = xlim or sorted(save_times)[-5]
 	lsave = ax.barh(indx - 0.3, save_times, height=height, color=next(cm), label='store',
 		xerr=tuple(inst.save_time_std * 1000 for inst in insts))
 	add_bar_labels(ax, lsave, save_times, xlim=xlim, fontsize=fontsize-3, template='{0:.0f}ms')